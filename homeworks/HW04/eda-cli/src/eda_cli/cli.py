@@ -1,48 +1,322 @@
 from __future__ import annotations
 
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import typer
 
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
 from .core import (
     DatasetSummary,
     compute_quality_flags,
-    correlation_matrix,
+    correlation_from_array,
+    correlation_pairs,
     flatten_summary_for_print,
     missing_table,
+    summarize_chunks,
     summarize_dataset,
     top_categories,
 )
 from .viz import (
-    plot_correlation_heatmap,
-    plot_missing_matrix,
-    plot_histograms_per_column,
+    histogram_jobs_from_array,
+    plot_correlation_matrix,
+    plot_histogram,
+    plot_missing_mask,
+    save_top_categories_parquet,
     save_top_categories_tables,
 )
 
 app = typer.Typer(help="Мини-CLI для EDA CSV-файлов")
 
 
+_CACHE_KEY = b"eda_cli_source"
+
+
+def _cache_path(path: Path) -> Path:
+    return path.with_suffix(path.suffix + ".parquet")
+
+
+def _source_key(st: os.stat_result, sep: str, encoding: str) -> Dict[str, Any]:
+    # Парсер тоже часть ключа: от него зависят выведенные типы колонок
+    return {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "sep": sep,
+        "encoding": encoding,
+        "parser": f"pyarrow.csv/{pa.__version__}",
+    }
+
+
+def _with_key(table: "pa.Table", key: Dict[str, Any]) -> "pa.Table":
+    metadata = dict(table.schema.metadata or {})
+    metadata[_CACHE_KEY] = json.dumps(key).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def _numpy_like_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Приводит Arrow-типы, которые pandas трактует иначе, чем numpy-типы из обычного
+    read_csv: bool[pyarrow] -> boolean (числовой, как numpy bool), а полностью
+    пустая колонка null[pyarrow] -> double[pyarrow] (как float64 из NaN).
+    """
+    fixes = {}
+    for name, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.ArrowDtype):
+            if pa.types.is_boolean(dtype.pyarrow_dtype):
+                fixes[name] = pd.BooleanDtype()
+            elif pa.types.is_null(dtype.pyarrow_dtype):
+                fixes[name] = pd.ArrowDtype(pa.float64())
+    return df.astype(fixes) if fixes else df
+
+
+def _pandas_column_names(names: List[str]) -> List[str]:
+    """
+    Имена колонок как у pd.read_csv: пустой заголовок -> 'Unnamed: i',
+    повторы -> 'a.1', 'a.2', ... (Arrow оставляет повторяющиеся имена как есть).
+    """
+    names = [name if name != "" else f"Unnamed: {i}" for i, name in enumerate(names)]
+    counts: Dict[str, int] = {}
+    for i, col in enumerate(names):
+        base = col
+        cur = counts.get(col, 0)
+        while cur > 0:
+            counts[base] = cur + 1
+            col = f"{base}.{cur}"
+            # Имя вида 'a.1' уже может быть в заголовке — тогда берём следующий номер
+            cur = cur + 1 if col in names else counts.get(col, 0)
+        names[i] = col
+        counts[col] = cur + 1
+    return names
+
+
+def _arrow_to_pandas(data: Any, **kwargs: Any) -> pd.DataFrame:
+    """
+    Arrow-таблица или батч CSV -> DataFrame с именами колонок и типами как у pandas.
+    """
+    names = _pandas_column_names(data.column_names)
+    if names != data.column_names:
+        data = data.rename_columns(names)
+    return _numpy_like_dtypes(data.to_pandas(types_mapper=pd.ArrowDtype, **kwargs))
+
+
+def _read_cache(path: Path, key: Dict[str, Any]) -> Optional[pd.DataFrame]:
+    """
+    Читает Parquet-кэш рядом с CSV, если он соответствует текущей версии файла.
+    Ключ хранится в метаданных схемы, так что устаревший кэш отбрасывается без чтения данных.
+    """
+    cache = _cache_path(path)
+    try:
+        metadata = pq.read_schema(cache).metadata or {}
+        if json.loads(metadata.get(_CACHE_KEY, b"null")) != key:
+            return None
+        return _numpy_like_dtypes(pd.read_parquet(cache, engine="pyarrow", dtype_backend="pyarrow"))
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def _write_cache(df: pd.DataFrame, path: Path, key: Dict[str, Any]) -> None:
+    """
+    Сохраняет распарсенный датафрейм в Parquet-кэш (ошибки записи игнорируются).
+    """
+    try:
+        table = _with_key(pa.Table.from_pandas(df, preserve_index=False), key)
+        pq.write_table(table, _cache_path(path), compression="snappy")
+    except Exception:  # noqa: BLE001
+        pass
+
+
+def _tee_to_cache(
+    chunks: Iterable[pd.DataFrame],
+    path: Path,
+    key: Dict[str, Any],
+) -> Iterator[pd.DataFrame]:
+    """
+    Отдаёт части CSV дальше и попутно дописывает их в Parquet-кэш, чтобы
+    следующая команда (например, report после overview) не разбирала CSV заново.
+    Части должны приходить из _iter_csv: он разбирает файл тем же парсером, что и
+    _load_csv, так что кэш совпадает с полным чтением. Если чтение оборвалось
+    или типы частей разошлись, кэш не создаётся.
+    """
+    cache = _cache_path(path)
+    tmp = cache.with_name(cache.name + ".tmp")
+    writer = None
+    ok = True
+    completed = False
+    try:
+        for chunk in chunks:
+            if ok:
+                try:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp, _with_key(table, key).schema, compression="snappy")
+                    writer.write_table(table)
+                except Exception:  # noqa: BLE001
+                    ok = False
+            yield chunk
+        completed = True
+    finally:
+        if writer is not None:
+            try:
+                writer.close()
+            except Exception:  # noqa: BLE001
+                ok = False
+            if ok and completed:
+                tmp.replace(cache)
+            else:
+                tmp.unlink(missing_ok=True)
+
+
+_ARROW_BLOCK_SIZE = 64 << 20
+# Потоковое чтение (head, overview) идёт блоками поменьше, чтобы начало файла читалось быстро
+_ARROW_STREAM_BLOCK_SIZE = 1 << 20
+
+
+def _arrow_csv_options(sep: str, encoding: str, block_size: int) -> Dict[str, Any]:
+    """
+    Общие настройки парсера Arrow для полного и потокового чтения,
+    чтобы оба пути одинаково выводили типы колонок.
+    """
+    return {
+        "read_options": pa_csv.ReadOptions(
+            block_size=block_size,
+            use_threads=True,
+            encoding=encoding,
+        ),
+        "parse_options": pa_csv.ParseOptions(delimiter=sep),
+        "convert_options": pa_csv.ConvertOptions(strings_can_be_null=True),
+    }
+
+
+def _read_csv_arrow(path: Path, sep: str, encoding: str) -> pd.DataFrame:
+    """
+    Многопоточное чтение CSV парсером Arrow без обёртки pandas.
+    Arrow-буферы освобождаются по ходу конвертации (self_destruct), поэтому пик памяти ниже.
+    """
+    table = pa_csv.read_csv(path, **_arrow_csv_options(sep, encoding, _ARROW_BLOCK_SIZE))
+    return _arrow_to_pandas(table, self_destruct=True, split_blocks=True)
+
+
 def _load_csv(
     path: Path,
     sep: str = ",",
     encoding: str = "utf-8",
+    use_cache: bool = True,
 ) -> pd.DataFrame:
-    if not path.exists():
-        raise typer.BadParameter(f"Файл '{path}' не найден")
     try:
-        return pd.read_csv(path, sep=sep, encoding=encoding)
+        # Отдельной проверки exists() нет: отсутствие файла ловим по FileNotFoundError
+        if use_cache:
+            key = _source_key(path.stat(), sep, encoding)
+            cached = _read_cache(path, key)
+            if cached is not None:
+                return cached
+
+        df = _read_csv_arrow(path, sep=sep, encoding=encoding)
+    except FileNotFoundError as exc:
+        raise typer.BadParameter(f"Файл '{path}' не найден") from exc
+    except Exception as exc:  # noqa: BLE001
+        raise typer.BadParameter(f"Не удалось прочитать CSV: {exc}") from exc
+
+    if use_cache:
+        _write_cache(df, path, key)
+    return df
+
+
+class _StreamTypeError(Exception):
+    """
+    Очередной блок CSV не укладывается в типы, выведенные по первому блоку.
+    """
+
+
+def _iter_csv(
+    path: Path,
+    sep: str = ",",
+    encoding: str = "utf-8",
+) -> Iterator[pd.DataFrame]:
+    """
+    Читает CSV по частям, не загружая файл в память целиком.
+
+    Части читаются тем же парсером, что и в _load_csv. Потоковый читатель Arrow
+    фиксирует типы по первому блоку; если дальше они не подходят (полное чтение
+    в этом случае вывело бы более общий тип), бросается _StreamTypeError,
+    и вызывающий код читает файл целиком.
+    """
+    try:
+        reader = pa_csv.open_csv(path, **_arrow_csv_options(sep, encoding, _ARROW_STREAM_BLOCK_SIZE))
+    except FileNotFoundError as exc:
+        raise typer.BadParameter(f"Файл '{path}' не найден") from exc
     except Exception as exc:  # noqa: BLE001
         raise typer.BadParameter(f"Не удалось прочитать CSV: {exc}") from exc
 
+    with reader:
+        n_batches = 0
+        while True:
+            try:
+                batch = reader.read_next_batch()
+            except StopIteration:
+                break
+            except pa.ArrowInvalid as exc:
+                raise _StreamTypeError(str(exc)) from exc
+            n_batches += 1
+            yield _arrow_to_pandas(batch)
+        if n_batches == 0:
+            # В файле только заголовок: отдаём пустую часть, чтобы не потерять колонки
+            yield _arrow_to_pandas(reader.schema.empty_table())
+
+
+_TABLE_FORMATS = ("csv", "parquet", "feather")
+
+
+def _check_format(fmt: str) -> str:
+    if fmt not in _TABLE_FORMATS:
+        raise typer.BadParameter(f"Неизвестный формат '{fmt}', допустимы: {', '.join(_TABLE_FORMATS)}")
+    return fmt
+
+
+def _write_table(df: pd.DataFrame, path_no_ext: Path, fmt: str, index: bool = False) -> Path:
+    """
+    Сохраняет табличный артефакт в CSV, Parquet или Feather; расширение = формат.
+    """
+    out_path = path_no_ext.with_suffix(f".{fmt}")
+    if fmt == "parquet":
+        df.to_parquet(out_path, engine="pyarrow", compression="snappy", index=index)
+    elif fmt == "feather":
+        # Feather не хранит индекс, поэтому при необходимости делаем его колонкой
+        (df.reset_index() if index else df.reset_index(drop=True)).to_feather(out_path)
+    else:
+        df.to_csv(out_path, index=index)
+    return out_path
+
+
+def _render_plots(jobs: List[Tuple[Callable[..., Any], tuple]]) -> None:
+    """
+    Рисует независимые графики параллельно в отдельных процессах:
+    отрисовка PNG в matplotlib упирается в CPU.
+    """
+    if not jobs:
+        return
+    workers = min(os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fn, *args) for fn, args in jobs]
+        for future in futures:
+            future.result()
+
 
 @app.command()
 def overview(
     path: str = typer.Argument(..., help="Путь к CSV-файлу."),
     sep: str = typer.Option(",", help="Разделитель в CSV."),
     encoding: str = typer.Option("utf-8", help="Кодировка файла."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Не использовать Parquet-кэш рядом с CSV."),
 ) -> None:
     """
     Напечатать краткий обзор датасета:
@@ -50,8 +324,29 @@ def overview(
     - типы;
     - простая табличка по колонкам.
     """
-    df = _load_csv(Path(path), sep=sep, encoding=encoding)
-    summary: DatasetSummary = summarize_dataset(df)
+    p = Path(path)
+    use_cache = not no_cache
+    cached = None
+    if use_cache:
+        try:
+            key = _source_key(p.stat(), sep, encoding)
+        except FileNotFoundError as exc:
+            raise typer.BadParameter(f"Файл '{p}' не найден") from exc
+        cached = _read_cache(p, key)
+
+    if cached is not None:
+        summary: DatasetSummary = summarize_dataset(cached)
+    else:
+        # Без готового кэша считаем статистики потоково, по частям файла,
+        # и заодно сохраняем их в кэш для следующих команд
+        chunks = _iter_csv(p, sep=sep, encoding=encoding)
+        if use_cache:
+            chunks = _tee_to_cache(chunks, p, key)
+        try:
+            summary = summarize_chunks(chunks)
+        except _StreamTypeError:
+            # Типы колонок уточнились после первого блока: читаем файл целиком, как report
+            summary = summarize_dataset(_load_csv(p, sep=sep, encoding=encoding, use_cache=use_cache))
     summary_df = flatten_summary_for_print(summary)
 
     typer.echo(f"Строк: {summary.n_rows}")
@@ -66,27 +361,172 @@ def head(
     n: int = typer.Option(5, help="Количество строк для вывода."),
     sep: str = typer.Option(",", help='Разделитель в CSV.'),
     encoding: str = typer.Option("utf-8", help="Кодировка файла."),
-    show_header: bool = typer.Option(True, help="Показывать заголовки колонок.")
+    show_header: bool = typer.Option(True, help="Показывать заголовки колонок."),
     ) -> None:
-        df = _load_csv(Path(path), sep=sep, encoding=encoding)
-
+        p = Path(path)
         if n < 0:
             typer.echo("Параметр n должен быть положительным.")
             raise typer.Exit(code=1)
-        
+
+        # Читаем только начало файла: n строк и ещё одну, чтобы понять, есть ли продолжение
+        chunks: List[pd.DataFrame] = []
+        n_read = 0
+        try:
+            for chunk in _iter_csv(p, sep=sep, encoding=encoding):
+                chunks.append(chunk)
+                n_read += len(chunk)
+                if n_read > n:
+                    break
+            df = pd.concat(chunks, ignore_index=True).iloc[: n + 1] if chunks else pd.DataFrame()
+        except _StreamTypeError:
+            df = _load_csv(p, sep=sep, encoding=encoding)
+            n_read = len(df)
+            df = df.iloc[: n + 1]
+        has_more = n_read > n
+
         if n > len(df):
             typer.echo(f"Количество строк (n) должно быть меньше, чем число строк в файле (< {len(df)}).")
             n = len(df)
 
-        typer.echo(f"Файл: {Path(path).name}")
-        typer.echo(f"Количество строк: {len(df)}")
+        typer.echo(f"Файл: {p.name}")
+        if has_more:
+            typer.echo(f"Количество строк: больше {n}")
+        else:
+            typer.echo(f"Количество строк: {len(df)}")
         typer.echo(f"Количество колонок: {len(df.columns)}")    
         typer.echo(f"Первые {n} строк:\n")   
-        with pd.option_context('display.max_rows', n,
-                                'display.max_columns', None,
-                                'display.width', None,
-                                'display.max_colwidth', 30):
-            typer.echo(df.head(n).to_string(index=False, header=show_header)) 
+        # Пишем таблицу сразу в stdout, без промежуточной строки
+        df.iloc[:n].to_string(buf=sys.stdout, index=False, header=show_header, max_colwidth=30)
+        sys.stdout.write("\n")
+
+def _render_report_md(
+    title: str,
+    source_name: str,
+    summary: DatasetSummary,
+    quality_flags: Dict[str, Any],
+    missing_df: pd.DataFrame,
+    corr_df: pd.DataFrame,
+    top_cats: Dict[str, pd.DataFrame],
+    max_hist_columns: int,
+    top_k_categories: int,
+    min_missing_share: float,
+    num_numeric: int,
+    table_format: str = "csv",
+    corr_format: str = "csv",
+    legacy_top_cats: bool = False,
+) -> str:
+    """
+    Собирает текст Markdown-отчёта в памяти и возвращает его одной строкой.
+    """
+    buf = io.StringIO()
+    buf.write(f"# {title}\n\n")
+    buf.write(f"**Дата генерации:** {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+    # Параметры анализа
+    buf.write("## Параметры анализа\n\n")
+    buf.write(f"- **Максимальное количество гистограмм:** `{max_hist_columns}`\n")
+    buf.write(f"- **Максимальное количество топ-категорий:** `{top_k_categories}`\n")
+    buf.write(f"- **Порог доли пропусков для проблемных колонок:** `{min_missing_share}`\n\n")
+
+    buf.write(f"**Исходный файл:** `{source_name}`\n\n")
+    buf.write(f"**Строк:** {summary.n_rows}, **столбцов:** {summary.n_cols}\n\n")
+
+    buf.write("## Качество данных (эвристики)\n\n")
+    buf.write(f"- **Общая оценка качества:** {quality_flags['quality_score']:.2f}/1.0\n")
+    buf.write(f"- **Максимальная доля пропусков:** {quality_flags['max_missing_share']:.2%}\n")
+    buf.write(f"- **Слишком мало строк (<100):** {quality_flags['too_few_rows']}\n")
+    buf.write(f"- **Слишком много колонок (>100):** {quality_flags['too_many_columns']}\n")
+    buf.write(f"- **Слишком много пропусков (>50%):** {quality_flags['too_many_missing']}\n")
+
+    # Новые эвристики
+    buf.write(f"- **Используемый порог пропусков:** {quality_flags['cli_min_missing_threshold']}\n")
+
+    buf.write(f"- **Колонок с пропусками > порога:** {quality_flags['n_problematic_by_threshold']}\n")
+    if quality_flags['n_problematic_by_threshold'] > 0:
+        buf.write("  - Список:\n")
+        for col, share in quality_flags['problematic_cols_by_threshold']:
+            buf.write(f"    - `{col}`: {share:.1%}\n")
+
+    buf.write(f"- **Количество константных колонок:** {quality_flags['n_constant_columns']}\n")
+
+    buf.write(f"- **Порог для нулевых значений:** {quality_flags['cli_zero_threshold']:.1%}\n")
+
+    if 'zero_check_skipped' in quality_flags:
+        buf.write(f"- **Статус проверки нулей:** {quality_flags['zero_check_skipped']}\n")
+
+    buf.write(f"- **Есть константные колонки:** {quality_flags['has_constant_columns']}\n")
+    if quality_flags['has_constant_columns']:
+        const_cols = quality_flags.get('constant_columns', [])
+        buf.write(f"  - Константные колонки: {', '.join(const_cols)}\n")
+
+    buf.write(f"- **Есть категории с высокой кардинальностью:** {quality_flags['has_high_cardinality_categoricals']}\n")
+    if quality_flags['has_high_cardinality_categoricals']:
+        threshold = quality_flags.get('high_cardinality_threshold', 0)
+        high_card_pct = quality_flags.get('cli_high_cardinality_pct', 0.3) * 100
+        high_card_cols = quality_flags.get('high_cardinality_categoricals', [])
+        buf.write(f"  - Проблемные колонки (уникальных значений > {high_card_pct:.0f}):\n")
+        for item in high_card_cols:
+            percentage = (item['unique_values'] / summary.n_rows) * 100
+            buf.write(f"    - `{item['column_name']}`: {item['unique_values']} уникальных ({percentage:.0f}%)\n")
+
+    buf.write(f"- **Есть подозрительные дубликаты ID:** {quality_flags['has_suspicious_id_duplicates']}\n")
+    if quality_flags['has_suspicious_id_duplicates']:
+        buf.write(f"  - Колонки с возможными дубликатами:\n")
+        for item in quality_flags.get('suspicious_id_duplicates', []):
+            buf.write(f"    - `{item['column_name']}`: {item['unique_count']} уникальных ({item['unique_share']:.1%})\n")
+
+    buf.write(f"- **Есть колонки с большим количеством нулей:** {quality_flags['has_many_zero_values']}\n")
+    if quality_flags['has_many_zero_values']:
+        zero_thresh = quality_flags.get('cli_zero_threshold', 0.4)
+        buf.write(f"  - Колонки с > {zero_thresh:.0%} нулевых значений:\n")
+        for item in quality_flags.get('many_zero_values', []):
+            buf.write(f"    - `{item['column_name']}`: {item['zero_share']:.1%} нулей\n")
+
+    buf.write("\n")
+
+    buf.write(f"## Колонки с большим количеством пропусков (порог > {min_missing_share})\n\n")
+    # Тот же порог, что передан в compute_quality_flags: список уже посчитан
+    problematic_cols = quality_flags["problematic_cols_by_threshold"]
+
+    if problematic_cols:
+        for col, share in problematic_cols:
+            buf.write(f"- `{col}`: {share:.1%} пропусков\n")
+        buf.write(f"\nВсего проблемных колонок: **{len(problematic_cols)}**\n\n")
+    else:
+        buf.write("Нет колонок с превышением порога пропусков.\n\n")
+
+    # Остальные разделы
+    buf.write("## Детальная информация по колонкам\n\n")
+    buf.write(f"Полная информация доступна в файле `summary.{table_format}`.\n\n")
+
+    buf.write("## Анализ пропусков\n\n")
+    if missing_df.empty:
+        buf.write("Пропуски не обнаружены или датасет пуст.\n\n")
+    else:
+        buf.write(f"Детальная статистика пропусков в файле `missing.{table_format}`.\n")
+        buf.write("Визуализация пропусков: `missing_matrix.png`\n\n")
+
+    buf.write("## Корреляционный анализ\n\n")
+    if corr_df.empty:
+        buf.write("Недостаточно числовых колонок для анализа корреляции.\n\n")
+    else:
+        buf.write(f"Корреляционная матрица в файле `correlation.{corr_format}`, ")
+        buf.write(f"пары колонок без повторов — в `correlation_pairs.{table_format}`.\n")
+        buf.write("Тепловая карта корреляций: `correlation_heatmap.png`\n\n")
+
+    buf.write("## Анализ категориальных признаков\n\n")
+    if not top_cats:
+        buf.write("Категориальные признаки не обнаружены.\n\n")
+    else:
+        location = "в папке `top_categories/`" if legacy_top_cats else "в файле `top_categories.parquet`"
+        buf.write(f"Топ-{top_k_categories} значений для каждой категориальной колонки сохранены {location}.\n\n")
+
+    buf.write("## Визуализации\n\n")
+    actual_histograms = min(max_hist_columns, num_numeric)
+    buf.write(f"Гистограммы для {actual_histograms} из {num_numeric} числовых колонок.\n")
+    buf.write("См. файлы `hist_*.png`.\n")
+    return buf.getvalue()
+
 
 @app.command()
 def report(
@@ -97,7 +537,11 @@ def report(
     max_hist_columns: int = typer.Option(6, help="Максимум числовых колонок для гистограмм."),
     top_k_categories: int = typer.Option(5, help="Количество топ-значений для категориальных признаков."),
     title: str = typer.Option("Анализ данных", help="Заголовок отчёта."),
-    min_missing_share: float = typer.Option(0.3, help="Порог доли пропусков для пометки колонки как проблемной.")
+    min_missing_share: float = typer.Option(0.3, help="Порог доли пропусков для пометки колонки как проблемной."),
+    table_format: str = typer.Option("csv", "--format", help="Формат табличных файлов: csv, parquet или feather."),
+    corr_format: str = typer.Option("parquet", "--corr-format", help="Формат корреляционной матрицы: csv, parquet или feather."),
+    legacy_top_cats: bool = typer.Option(False, "--legacy-top-cats", help="Сохранять top-k категорий отдельными CSV в top_categories/."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Не использовать Parquet-кэш рядом с CSV."),
 ) -> None:
     """
     Сгенерировать полный EDA-отчёт:
@@ -107,16 +551,31 @@ def report(
     - top-k категорий по категориальным признакам;
     - картинки: гистограммы, матрица пропусков, heatmap корреляции.
     """
+    _check_format(table_format)
+    _check_format(corr_format)
+    p = Path(path)
     out_root = Path(out_dir)
     out_root.mkdir(parents=True, exist_ok=True)
 
-    df = _load_csv(Path(path), sep=sep, encoding=encoding)
+    df = _load_csv(p, sep=sep, encoding=encoding, use_cache=not no_cache)
+
+    # Числовые колонки выделяем один раз: float32-массив по колонкам (Fortran-порядок)
+    # общий для корреляции и гистограмм; float32 — вдвое меньше памяти и трафика
+    numeric = df.select_dtypes(include="number")
+    num_cols = list(numeric.columns)
+    n_num = len(num_cols)
+    # Числовой блок выделяем один раз, сразу в порядке по колонкам (F-order),
+    # и переиспользуем в корреляции, проверке нулей и гистограммах
+    num_arr = np.empty((len(numeric), n_num), dtype=np.float32, order="F")
+    for j in range(n_num):
+        num_arr[:, j] = numeric.iloc[:, j].to_numpy(dtype=np.float32, na_value=np.nan)
 
     # 1. Обзор
     summary = summarize_dataset(df)
     summary_df = flatten_summary_for_print(summary)
     missing_df = missing_table(df)
-    corr_df = correlation_matrix(df)
+    # Корреляция имеет смысл только для двух и более числовых колонок и хотя бы двух строк
+    corr_df = correlation_from_array(num_arr, num_cols) if n_num >= 2 and len(df) >= 2 else pd.DataFrame()
     top_cats = top_categories(df, top_k=top_k_categories)
 
     # 2. Качество в целом
@@ -126,136 +585,68 @@ def report(
         df,
         min_missing_threshold=min_missing_share,
         high_cardinality_pct=0.3,
-        zero_threshold=0.4
+        zero_threshold=0.4,
+        numeric_block=num_arr,
+        numeric_columns=num_cols,
         )
 
     # 3. Сохраняем табличные артефакты
-    summary_df.to_csv(out_root / "summary.csv", index=False)
+    # В итоговую сводку попадают только реально записанные файлы
+    table_names = [_write_table(summary_df, out_root / "summary", table_format).name]
     if not missing_df.empty:
-        missing_df.to_csv(out_root / "missing.csv", index=True)
+        table_names.append(_write_table(missing_df, out_root / "missing", table_format, index=True).name)
     if not corr_df.empty:
-        corr_df.to_csv(out_root / "correlation.csv", index=True)
-    save_top_categories_tables(top_cats, out_root / "top_categories", top_k=top_k_categories)
+        table_names.append(_write_table(corr_df, out_root / "correlation", corr_format, index=True).name)
+        table_names.append(
+            _write_table(correlation_pairs(corr_df), out_root / "correlation_pairs", table_format).name
+        )
+    if legacy_top_cats:
+        if save_top_categories_tables(top_cats, out_root / "top_categories", top_k=top_k_categories):
+            table_names.append("top_categories/*.csv")
+    else:
+        top_path = save_top_categories_parquet(top_cats, out_root / "top_categories.parquet")
+        if top_path is not None:
+            table_names.append(top_path.name)
 
     # 4. Markdown-отчёт
     md_path = out_root / "report.md"
-    with md_path.open("w", encoding="utf-8") as f:
-        f.write(f"# {title}\n\n")
-        f.write(f"**Дата генерации:** {pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        
-        # Параметры анализа
-        f.write("## Параметры анализа\n\n")
-        f.write(f"- **Максимальное количество гистограмм:** `{max_hist_columns}`\n")
-        f.write(f"- **Максимальное количество топ-категорий:** `{top_k_categories}`\n")
-        f.write(f"- **Порог доли пропусков для проблемных колонок:** `{min_missing_share}`\n\n")
-
-        f.write(f"**Исходный файл:** `{Path(path).name}`\n\n")
-        f.write(f"**Строк:** {summary.n_rows}, **столбцов:** {summary.n_cols}\n\n")
-
-        f.write("## Качество данных (эвристики)\n\n")
-        f.write(f"- **Общая оценка качества:** {quality_flags['quality_score']:.2f}/1.0\n")
-        f.write(f"- **Максимальная доля пропусков:** {quality_flags['max_missing_share']:.2%}\n")
-        f.write(f"- **Слишком мало строк (<100):** {quality_flags['too_few_rows']}\n")
-        f.write(f"- **Слишком много колонок (>100):** {quality_flags['too_many_columns']}\n")
-        f.write(f"- **Слишком много пропусков (>50%):** {quality_flags['too_many_missing']}\n")
-        
-        # Новые эвристики
-        f.write(f"- **Используемый порог пропусков:** {quality_flags['cli_min_missing_threshold']}\n")
-
-        f.write(f"- **Колонок с пропусками > порога:** {quality_flags['n_problematic_by_threshold']}\n")
-        if quality_flags['n_problematic_by_threshold'] > 0:
-            f.write("  - Список:\n")
-            for col, share in quality_flags['problematic_cols_by_threshold']:
-                f.write(f"    - `{col}`: {share:.1%}\n")
-
-        f.write(f"- **Количество константных колонок:** {quality_flags['n_constant_columns']}\n")
-
-        f.write(f"- **Порог для нулевых значений:** {quality_flags['cli_zero_threshold']:.1%}\n")
-
-        if 'zero_check_skipped' in quality_flags:
-            f.write(f"- **Статус проверки нулей:** {quality_flags['zero_check_skipped']}\n")
-
-        f.write(f"- **Есть константные колонки:** {quality_flags['has_constant_columns']}\n")
-        if quality_flags['has_constant_columns']:
-            const_cols = quality_flags.get('constant_columns', [])
-            f.write(f"  - Константные колонки: {', '.join(const_cols)}\n")
-        
-        f.write(f"- **Есть категории с высокой кардинальностью:** {quality_flags['has_high_cardinality_categoricals']}\n")
-        if quality_flags['has_high_cardinality_categoricals']:
-            threshold = quality_flags.get('high_cardinality_threshold', 0)
-            high_card_pct = quality_flags.get('cli_high_cardinality_pct', 0.3) * 100
-            high_card_cols = quality_flags.get('high_cardinality_categoricals', [])
-            f.write(f"  - Проблемные колонки (уникальных значений > {high_card_pct:.0f}):\n")
-            for item in high_card_cols:
-                percentage = (item['unique_values'] / summary.n_rows) * 100
-                f.write(f"    - `{item['column_name']}`: {item['unique_values']} уникальных ({percentage:.0f}%)\n")
-        
-        f.write(f"- **Есть подозрительные дубликаты ID:** {quality_flags['has_suspicious_id_duplicates']}\n")
-        if quality_flags['has_suspicious_id_duplicates']:
-            f.write(f"  - Колонки с возможными дубликатами:\n")
-            for item in quality_flags.get('suspicious_id_duplicates', []):
-                f.write(f"    - `{item['column_name']}`: {item['unique_count']} уникальных ({item['unique_share']:.1%})\n")
-        
-        f.write(f"- **Есть колонки с большим количеством нулей:** {quality_flags['has_many_zero_values']}\n")
-        if quality_flags['has_many_zero_values']:
-            zero_thresh = quality_flags.get('cli_zero_threshold', 0.4)
-            f.write(f"  - Колонки с > {zero_thresh:.0%} нулевых значений:\n")
-            for item in quality_flags.get('many_zero_values', []):
-                f.write(f"    - `{item['column_name']}`: {item['zero_share']:.1%} нулей\n")
-        
-        f.write("\n")
-
-        f.write(f"## Колонки с большим количеством пропусков (порог > {min_missing_share})\n\n")
-        problematic_cols = []
-        for idx, row in missing_df.iterrows():
-            if row['missing_share'] > min_missing_share:
-                problematic_cols.append((idx, row['missing_share']))
-        
-        if problematic_cols:
-            for col, share in problematic_cols:
-                f.write(f"- `{col}`: {share:.1%} пропусков\n")
-            f.write(f"\nВсего проблемных колонок: **{len(problematic_cols)}**\n\n")
-        else:
-            f.write("Нет колонок с превышением порога пропусков.\n\n")
-
-        # Остальные разделы
-        f.write("## Детальная информация по колонкам\n\n")
-        f.write("Полная информация доступна в файле `summary.csv`.\n\n")
-
-        f.write("## Анализ пропусков\n\n")
-        if missing_df.empty:
-            f.write("Пропуски не обнаружены или датасет пуст.\n\n")
-        else:
-            f.write("Детальная статистика пропусков в файле `missing.csv`.\n")
-            f.write("Визуализация пропусков: `missing_matrix.png`\n\n")
+    md_text = _render_report_md(
+        title=title,
+        source_name=p.name,
+        summary=summary,
+        quality_flags=quality_flags,
+        missing_df=missing_df,
+        corr_df=corr_df,
+        top_cats=top_cats,
+        max_hist_columns=max_hist_columns,
+        top_k_categories=top_k_categories,
+        min_missing_share=min_missing_share,
+        num_numeric=n_num,
+        table_format=table_format,
+        corr_format=corr_format,
+        legacy_top_cats=legacy_top_cats,
+    )
+    md_path.write_text(md_text, encoding="utf-8")
 
-        f.write("## Корреляционный анализ\n\n")
-        if corr_df.empty:
-            f.write("Недостаточно числовых колонок для анализа корреляции.\n\n")
-        else:
-            f.write("Корреляционная матрица в файле `correlation.csv`.\n")
-            f.write("Тепловая карта корреляций: `correlation_heatmap.png`\n\n")
-
-        f.write("## Анализ категориальных признаков\n\n")
-        if not top_cats:
-            f.write("Категориальные признаки не обнаружены.\n\n")
-        else:
-            f.write(f"Топ-{top_k_categories} значений для каждой категориальной колонки сохранены в папке `top_categories/`.\n\n")
-
-        f.write("## Визуализации\n\n")
-        num_numeric = len(df.select_dtypes(include='number').columns)
-        actual_histograms = min(max_hist_columns, num_numeric)
-        f.write(f"Гистограммы для {actual_histograms} из {num_numeric} числовых колонок.\n")
-        f.write("См. файлы `hist_*.png`.\n")
     # 5. Картинки
-    plot_histograms_per_column(df, out_root, max_columns=max_hist_columns)
-    plot_missing_matrix(df, out_root / "missing_matrix.png")
-    plot_correlation_heatmap(df, out_root / "correlation_heatmap.png")
+    # В процессы передаём только нужные массивы, а не весь датафрейм
+    plot_jobs: List[Tuple[Callable[..., Any], tuple]] = [
+        (plot_missing_mask, (df.isna().to_numpy(), list(df.columns), out_root / "missing_matrix.png")),
+    ]
+    plot_names = ["missing_matrix.png"]
+    if not corr_df.empty:
+        plot_jobs.append((plot_correlation_matrix, (corr_df, out_root / "correlation_heatmap.png")))
+        plot_names.append("correlation_heatmap.png")
+    hist_jobs = histogram_jobs_from_array(num_arr, num_cols, out_root, max_columns=max_hist_columns)
+    plot_jobs += [(plot_histogram, job) for job in hist_jobs]
+    if hist_jobs:
+        plot_names.insert(0, "hist_*.png")
+    _render_plots(plot_jobs)
 
     typer.echo(f"Отчёт сгенерирован в каталоге: {out_root}")
     typer.echo(f"- Основной markdown: {md_path}")
-    typer.echo("- Табличные файлы: summary.csv, missing.csv, correlation.csv, top_categories/*.csv")
-    typer.echo("- Графики: hist_*.png, missing_matrix.png, correlation_heatmap.png")
+    typer.echo(f"- Табличные файлы: {', '.join(table_names)}")
+    typer.echo(f"- Графики: {', '.join(plot_names)}")
 
 
 if __name__ == "__main__":
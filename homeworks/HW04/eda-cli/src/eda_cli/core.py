@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional, Sequence
+import math
+from dataclasses import dataclass, asdict, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 from pandas.api import types as ptypes
 
@@ -40,6 +43,79 @@ class DatasetSummary:
         }
 
 
+def _column_stats(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Счётчики по всем колонкам сразу (векторно, без цикла по колонкам):
+    количество пропусков и уникальных значений.
+    """
+    return {
+        "missing": df.isna().sum(axis=0).to_numpy(dtype=np.int64),
+        "nunique": df.nunique(dropna=True).to_numpy(dtype=np.int64),
+    }
+
+
+# Меньшие блоки быстрее посчитать numpy, чем ждать JIT-компиляции numba
+_NUMBA_MIN_SIZE = 1 << 20
+
+
+def _col_scan_numpy(arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    zeros = (arr == 0).sum(axis=0).astype(np.int64)
+    mn = np.fmin.reduce(arr, axis=0, initial=np.inf)
+    mx = np.fmax.reduce(arr, axis=0, initial=-np.inf)
+    return zeros, mn, mx
+
+
+@lru_cache(maxsize=None)
+def _col_scan_numba() -> Optional[Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]]:
+    """
+    Компилирует параллельный проход по колонкам при первом обращении;
+    None, если numba не установлена.
+    """
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, cache=True)
+    def scan(arr):
+        n, m = arr.shape
+        zeros = np.zeros(m, np.int64)
+        mn = np.full(m, np.inf)
+        mx = np.full(m, -np.inf)
+        for j in prange(m):
+            z = 0
+            lo = np.inf
+            hi = -np.inf
+            for i in range(n):
+                v = arr[i, j]
+                if v == 0:
+                    z += 1
+                # NaN не проходит ни одно сравнение и просто пропускается
+                if v < lo:
+                    lo = v
+                if v > hi:
+                    hi = v
+            zeros[j] = z
+            mn[j] = lo
+            mx[j] = hi
+        return zeros, mn, mx
+
+    return scan
+
+
+def _col_scan(arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Один проход по числовому блоку (строки x колонки, float64, NaN = пропуск):
+    число нулей, минимум и максимум каждой колонки. Для пустой колонки
+    минимум = +inf, максимум = -inf. На больших блоках использует numba, если она есть.
+    """
+    if arr.size >= _NUMBA_MIN_SIZE:
+        scan = _col_scan_numba()
+        if scan is not None:
+            return scan(np.asfortranarray(arr))
+    return _col_scan_numpy(arr)
+
+
 def summarize_dataset(
     df: pd.DataFrame,
     example_values_per_column: int = 3,
@@ -55,15 +131,16 @@ def summarize_dataset(
     """
     n_rows, n_cols = df.shape
     columns: List[ColumnSummary] = []
+    stats = _column_stats(df)
 
-    for name in df.columns:
-        s = df[name]
+    for i, name in enumerate(df.columns):
+        s = df.iloc[:, i]
         dtype_str = str(s.dtype)
 
-        non_null = int(s.notna().sum())
-        missing = n_rows - non_null
+        missing = int(stats["missing"][i])
+        non_null = n_rows - missing
         missing_share = float(missing / n_rows) if n_rows > 0 else 0.0
-        unique = int(s.nunique(dropna=True))
+        unique = int(stats["nunique"][i])
 
         # Примерные значения выводим как строки
         examples = (
@@ -79,10 +156,13 @@ def summarize_dataset(
         std_val: Optional[float] = None
 
         if is_numeric and non_null > 0:
-            min_val = float(s.min())
-            max_val = float(s.max())
-            mean_val = float(s.mean())
-            std_val = float(s.std())
+            # Считаем по numpy-массиву: у Arrow-колонок std() одного значения — pd.NA, а не NaN
+            values = s.to_numpy(dtype="float64", na_value=np.nan)
+            values = values[~np.isnan(values)]
+            min_val = float(values.min())
+            max_val = float(values.max())
+            mean_val = float(values.mean())
+            std_val = float(values.std(ddof=1)) if len(values) > 1 else float("nan")
 
         columns.append(
             ColumnSummary(
@@ -104,6 +184,133 @@ def summarize_dataset(
     return DatasetSummary(n_rows=n_rows, n_cols=n_cols, columns=columns)
 
 
+# Сколько 64-битных хэшей уникальных значений держим на колонку (8 байт на значение).
+# До этого предела число уникальных считается точно, дальше — оценивается по выборке
+# хэшей с погрешностью порядка 1/sqrt(предела), а память на колонку не растёт.
+_DISTINCT_LIMIT = 1 << 18
+_HASH_MAX = np.iinfo(np.uint64).max
+
+
+@dataclass
+class _ColumnAccumulator:
+    """
+    Накопитель статистик одной колонки при обходе датасета по частям.
+    """
+    dtype: Any = None
+    non_null: int = 0
+    # Отсортированные хэши уникальных значений, не больше _HASH_MAX >> level
+    hashes: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.uint64))
+    level: int = 0
+    examples: List[str] = field(default_factory=list)
+    n_numeric: int = 0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, s: pd.Series, example_values_per_column: int) -> None:
+        if self.dtype is None:
+            self.dtype = s.dtype
+        elif self.dtype != s.dtype:
+            # Общий тип, как при чтении файла целиком (например, int64 + float64 -> float64)
+            self.dtype = pd.concat(
+                [pd.Series([], dtype=self.dtype), pd.Series([], dtype=s.dtype)]
+            ).dtype
+
+        values = s.dropna()
+        if values.empty:
+            return
+        self.non_null += len(values)
+        self._add_distinct(values)
+
+        if len(self.examples) < example_values_per_column:
+            for v in values.astype(str).unique():
+                if v not in self.examples:
+                    self.examples.append(v)
+                if len(self.examples) >= example_values_per_column:
+                    break
+
+        if ptypes.is_numeric_dtype(s):
+            arr = values.to_numpy(dtype="float64")
+            n_b = len(arr)
+            mean_b = float(arr.mean())
+            m2_b = float(((arr - mean_b) ** 2).sum())
+            min_b, max_b = float(arr.min()), float(arr.max())
+
+            # Объединение среднего и суммы квадратов отклонений (Chan et al.)
+            n = self.n_numeric + n_b
+            delta = mean_b - self.mean
+            self.mean += delta * n_b / n
+            self.m2 += m2_b + delta * delta * self.n_numeric * n_b / n
+            self.n_numeric = n
+            self.min = min_b if self.min is None else min(self.min, min_b)
+            self.max = max_b if self.max is None else max(self.max, max_b)
+
+    def _add_distinct(self, values: pd.Series) -> None:
+        """
+        Адаптивная выборка хэшей: когда их больше _DISTINCT_LIMIT, оставляем только
+        меньшую половину диапазона; оценка числа уникальных — len(hashes) * 2**level.
+        """
+        h = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        h = np.sort(h[h <= _HASH_MAX >> self.level])
+        h = h[np.concatenate(([True], h[1:] != h[:-1]))] if len(h) else h
+        # Слияние с уже накопленными отсортированными хэшами за один проход
+        pos = np.searchsorted(self.hashes, h)
+        seen = pos < len(self.hashes)
+        seen[seen] = self.hashes[pos[seen]] == h[seen]
+        merged = np.insert(self.hashes, pos[~seen], h[~seen])
+        while len(merged) > _DISTINCT_LIMIT:
+            self.level += 1
+            merged = merged[merged <= _HASH_MAX >> self.level]
+        self.hashes = merged
+
+    def to_summary(self, name: str, n_rows: int) -> ColumnSummary:
+        missing = n_rows - self.non_null
+        is_numeric = bool(ptypes.is_numeric_dtype(self.dtype))
+        has_stats = is_numeric and self.n_numeric > 0
+        return ColumnSummary(
+            name=name,
+            dtype=str(self.dtype),
+            non_null=self.non_null,
+            missing=missing,
+            missing_share=float(missing / n_rows) if n_rows > 0 else 0.0,
+            unique=len(self.hashes) << self.level,
+            example_values=self.examples,
+            is_numeric=is_numeric,
+            min=self.min if has_stats else None,
+            max=self.max if has_stats else None,
+            mean=self.mean if has_stats else None,
+            std=(
+                math.sqrt(self.m2 / (self.n_numeric - 1))
+                if has_stats and self.n_numeric > 1
+                else (float("nan") if has_stats else None)
+            ),
+        )
+
+
+def summarize_chunks(
+    chunks: Iterable[pd.DataFrame],
+    example_values_per_column: int = 3,
+) -> DatasetSummary:
+    """
+    То же, что summarize_dataset, но по частям датасета (например, из
+    pd.read_csv(..., chunksize=...)): в памяти держится только текущая часть
+    и накопленные счётчики по колонкам. Число уникальных точное, пока их в колонке
+    не больше _DISTINCT_LIMIT, иначе — оценка (память на колонку ограничена).
+    """
+    n_rows = 0
+    accumulators: Dict[str, _ColumnAccumulator] = {}
+
+    for chunk in chunks:
+        n_rows += len(chunk)
+        for name in chunk.columns:
+            acc = accumulators.setdefault(name, _ColumnAccumulator())
+            acc.update(chunk[name], example_values_per_column)
+
+    columns = [acc.to_summary(name, n_rows) for name, acc in accumulators.items()]
+    return DatasetSummary(n_rows=n_rows, n_cols=len(columns), columns=columns)
+
+
 def missing_table(df: pd.DataFrame) -> pd.DataFrame:
     """
     Таблица пропусков по колонкам: count/share.
@@ -125,14 +332,101 @@ def missing_table(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
-def correlation_matrix(df: pd.DataFrame) -> pd.DataFrame:
+def _pearson_corr(x: np.ndarray) -> np.ndarray:
+    """
+    Корреляция Пирсона по столбцам матрицы x (с NaN), как в DataFrame.corr():
+    для каждой пары колонок учитываются только строки, где заполнены обе.
+    Вместо цикла по парам колонок — несколько матричных умножений.
+    """
+    mask = ~np.isnan(x)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        count = mask.sum(axis=0)
+        mean = np.where(mask, x, 0.0).sum(axis=0, dtype=np.float64) / np.maximum(count, 1)
+        # Центрируем и делим каждую колонку на максимум модуля (пропуски зануляем):
+        # корреляция от масштаба не зависит, а во float32 квадраты больших значений
+        # (например, меток времени в наносекундах) иначе переполнились бы до inf
+        x0 = np.where(mask, x - mean.astype(x.dtype), 0.0).astype(x.dtype, copy=False)
+        scale = np.abs(x0).max(axis=0, initial=0.0)
+        x0 /= np.where(scale > 0, scale, 1.0).astype(x.dtype)
+
+        if mask.all():
+            return _symmetrize(np.atleast_2d(np.corrcoef(x0, rowvar=False, dtype=x.dtype)))
+
+        m = mask.astype(x.dtype)
+        n = m.T @ m
+        sx = x0.T @ m  # sx[i, j] — сумма x_i по строкам, где заполнены и i, и j
+        sxx = (x0 * x0).T @ m
+        sxy = x0.T @ x0
+
+        cov = sxy - sx * sx.T / n
+        var = sxx - sx * sx / n
+        corr = cov / (np.sqrt(var) * np.sqrt(var.T))
+
+    corr[n < 2] = np.nan
+    return _symmetrize(np.clip(corr, -1.0, 1.0))
+
+
+def _symmetrize(corr: np.ndarray) -> np.ndarray:
+    """
+    Зеркалит верхний треугольник в нижний и ставит единицы на диагональ
+    (NaN остаётся для константных и пустых колонок).
+    """
+    upper = np.triu(corr, k=1)
+    diag = np.where(np.isnan(np.diag(corr)), np.nan, 1.0)
+    return upper + upper.T + np.diag(diag).astype(corr.dtype)
+
+
+def correlation_matrix(df: pd.DataFrame, method: str = "pearson") -> pd.DataFrame:
     """
     Корреляция Пирсона для числовых колонок.
+    Для других методов (spearman, kendall) используется DataFrame.corr().
+    Если все числовые колонки float32, расчёт идёт во float32 (вдвое меньше памяти).
     """
     numeric_df = df.select_dtypes(include="number")
     if numeric_df.empty:
         return pd.DataFrame()
-    return numeric_df.corr(numeric_only=True)
+    if method != "pearson":
+        return numeric_df.corr(method=method, numeric_only=True)
+
+    dtype = np.float32 if (numeric_df.dtypes == np.float32).all() else np.float64
+    values = numeric_df.to_numpy(dtype=dtype, na_value=np.nan)
+    return correlation_from_array(values, numeric_df.columns)
+
+
+def correlation_from_array(values: np.ndarray, columns: Sequence[str]) -> pd.DataFrame:
+    """
+    Корреляция Пирсона по готовому числовому массиву (строки x колонки, NaN = пропуск),
+    чтобы не выделять числовые колонки из датафрейма повторно.
+    """
+    if values.shape[1] == 0:
+        return pd.DataFrame()
+    columns = pd.Index(columns)
+    return pd.DataFrame(_pearson_corr(values), index=columns, columns=columns)
+
+
+def correlation_pairs(corr_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Корреляционная матрица симметрична, поэтому в длинном формате достаточно
+    пар над диагональю: столбцы col_i/col_j/corr.
+    """
+    if corr_df.empty:
+        return pd.DataFrame(columns=["col_i", "col_j", "corr"])
+    i, j = np.triu_indices(corr_df.shape[0], k=1)
+    columns = corr_df.columns.to_numpy()
+    return pd.DataFrame(
+        {
+            "col_i": columns[i],
+            "col_j": columns[j],
+            "corr": corr_df.to_numpy()[i, j],
+        }
+    )
+
+
+def _is_arrow_temporal(dtype: Any) -> bool:
+    """
+    Даты и время, распознанные парсером Arrow (при обычном чтении CSV это строки object).
+    """
+    return isinstance(dtype, pd.ArrowDtype) and dtype.kind == "M"
 
 
 def top_categories(
@@ -149,14 +443,34 @@ def top_categories(
 
     for name in df.columns:
         s = df[name]
-        if ptypes.is_object_dtype(s) or isinstance(s.dtype, pd.CategoricalDtype):
+        if (
+            ptypes.is_object_dtype(s)
+            or ptypes.is_string_dtype(s)
+            or isinstance(s.dtype, pd.CategoricalDtype)
+            or _is_arrow_temporal(s.dtype)
+        ):
             candidate_cols.append(name)
 
     for name in candidate_cols[:max_columns]:
         s = df[name]
-        vc = s.value_counts(dropna=True).head(top_k)
-        if vc.empty:
+        if _is_arrow_temporal(s.dtype):
+            # Значения дат храним строками, как они записаны в CSV
+            s = s.astype("string[pyarrow]")
+        # Без полной сортировки: выбираем top-k за O(u) и сортируем только их
+        vc = s.value_counts(sort=False, dropna=True)
+        if vc.empty or top_k <= 0:
             continue
+        counts = vc.to_numpy()
+        if len(counts) > top_k:
+            # Порог — k-я по величине частота; при равенстве берём значения,
+            # встретившиеся раньше, как и value_counts()
+            kth = np.partition(counts, -top_k)[-top_k]
+            greater = np.flatnonzero(counts > kth)
+            ties = np.flatnonzero(counts == kth)[: top_k - len(greater)]
+            idx = np.sort(np.concatenate([greater, ties]))
+        else:
+            idx = np.arange(len(counts))
+        vc = vc.iloc[idx[np.argsort(-counts[idx], kind="stable")]]
         share = vc / vc.sum()
         table = pd.DataFrame(
             {
@@ -170,18 +484,48 @@ def top_categories(
     return result
 
 
+def _zero_counts(
+    names: np.ndarray,
+    df: Optional[pd.DataFrame],
+    numeric_block: Optional[np.ndarray],
+    numeric_columns: Optional[Sequence[str]],
+) -> np.ndarray:
+    """
+    Число нулей в каждой из числовых колонок names: по готовому блоку,
+    а колонки, которых в нём нет, — по df.
+    """
+    zero_counts = np.zeros(len(names), dtype=np.int64)
+    in_block = np.zeros(len(names), dtype=bool)
+    if numeric_block is not None:
+        pos = {name: j for j, name in enumerate(numeric_columns)}
+        in_block = np.array([name in pos for name in names], dtype=bool)
+        block_zeros, _, _ = _col_scan(numeric_block)
+        zero_counts[in_block] = block_zeros[[pos[name] for name in names[in_block]]]
+    rest = names[~in_block].tolist()
+    if rest:
+        block = df.loc[:, rest].to_numpy(dtype=np.float64, na_value=np.nan)
+        zero_counts[~in_block] = _col_scan(block)[0]
+    return zero_counts
+
+
 def compute_quality_flags(summary: DatasetSummary,
     missing_df: pd.DataFrame,
     df: pd.DataFrame = None,
     min_missing_threshold: float = 0.3,
     high_cardinality_pct: float = 0.3,
-    zero_threshold: float = 0.4
+    zero_threshold: float = 0.4,
+    numeric_block: Optional[np.ndarray] = None,
+    numeric_columns: Optional[Sequence[str]] = None,
 ) -> Dict[str, Any]:
     """
     Простейшие эвристики «качества» данных:
     - слишком много пропусков;
     - подозрительно мало строк;
     и т.п.
+
+    numeric_block (строки x колонки numeric_columns, NaN = пропуск) — уже выделенный
+    числовой блок, чтобы не извлекать его из df повторно; числовые колонки, которых
+    в нём нет (например, boolean), берутся из df.
     """
     flags: Dict[str, Any] = {}
     flags["too_few_rows"] = summary.n_rows < 100
@@ -193,74 +537,97 @@ def compute_quality_flags(summary: DatasetSummary,
 
     flags["cli_min_missing_threshold"] = min_missing_threshold
     
-    problematic_by_threshold = []
-    for idx, row in missing_df.iterrows():
-        if row['missing_share'] > min_missing_threshold:
-            problematic_by_threshold.append((idx, row['missing_share']))
+    mask = missing_df["missing_share"] > min_missing_threshold
+    problematic = missing_df.loc[mask, "missing_share"]
+    problematic_by_threshold = list(zip(problematic.index, problematic.to_numpy()))
     flags["problematic_cols_by_threshold"] = problematic_by_threshold
     flags["n_problematic_by_threshold"] = len(problematic_by_threshold)
 
     flags["cli_high_cardinality_pct"] = high_cardinality_pct
     flags["cli_zero_threshold"] = zero_threshold
 
-    constant_columns = []
-    for col in summary.columns:
-        if col.unique == 1:
-            constant_columns.append(col.name)
+    # Колоночные признаки из summary как массивы: дальше только булевы маски
+    names = np.array([c.name for c in summary.columns], dtype=object)
+    unique = np.array([c.unique for c in summary.columns], dtype=np.int64)
+    non_null = np.array([c.non_null for c in summary.columns], dtype=np.int64)
+    is_numeric = np.array([c.is_numeric for c in summary.columns], dtype=bool)
+    dtype_strs = [str(c.dtype).lower() for c in summary.columns]
+    is_categorical = np.array(
+        [
+            ("object" in d or "category" in d or "string" in d or "date" in d or "timestamp" in d)
+            for d in dtype_strs
+        ],
+        dtype=bool,
+    )
+
+    # Числовая колонка константна, если минимум совпадает с максимумом (точные значения из summary)
+    constant_mask = unique == 1
+    has_values = df is not None or numeric_block is not None
+    if has_values:
+        col_min = np.array([np.nan if c.min is None else c.min for c in summary.columns], dtype=np.float64)
+        col_max = np.array([np.nan if c.max is None else c.max for c in summary.columns], dtype=np.float64)
+        known = set(numeric_columns or ()) | set(df.columns if df is not None else ())
+        num_mask = is_numeric & np.array([name in known for name in names], dtype=bool)
+        constant_mask[num_mask] = col_min[num_mask] == col_max[num_mask]
+        zero_counts = _zero_counts(names[num_mask], df, numeric_block, numeric_columns)
+
+    constant_columns = names[constant_mask].tolist()
     flags["has_constant_columns"] = len(constant_columns) > 0
     flags["constant_columns"] = constant_columns
     flags["n_constant_columns"] = len(constant_columns)  
    
-    high_cardinality_cols = []
     high_cardinality_threshold = round(summary.n_rows * high_cardinality_pct, 2)
-    for col in summary.columns:
-        dtype_str = str(col.dtype).lower() 
-        if "object" in dtype_str or "category" in dtype_str or "string" in dtype_str:
-            if col.unique > high_cardinality_threshold:
-                high_cardinality_cols.append({
-                    "column_name": col.name,
-                    "unique_values": col.unique,
-                    "threshold": high_cardinality_threshold 
-                })
+    high_card_mask = is_categorical & (unique > high_cardinality_threshold)
+    high_cardinality_cols = [
+        {
+            "column_name": name,
+            "unique_values": int(n_unique),
+            "threshold": high_cardinality_threshold,
+        }
+        for name, n_unique in zip(names[high_card_mask], unique[high_card_mask])
+    ]
     flags["has_high_cardinality_categoricals"] = len(high_cardinality_cols) > 0
     flags["high_cardinality_categoricals"] = high_cardinality_cols
     flags["high_cardinality_threshold"] = high_cardinality_threshold 
 
     suspicious_id_duplicates = []
-    
-    for col in summary.columns:
-        col_name_lower = col.name.lower()
-        if ('id' in col_name_lower or col_name_lower.endswith('_id')) and col.is_numeric:  
-            expected_unique = summary.n_rows  
-            actual_unique = col.unique
-            if expected_unique > 0:  
-                unique_share = actual_unique / expected_unique
-                if unique_share < 1:
-                    suspicious_id_duplicates.append({
-                        "column_name": col.name,
-                        "unique_count": actual_unique,
-                        "unique_share": unique_share,
-                        "duplicate_share": 1.0 - unique_share  
-                    })
+    if summary.n_rows > 0:
+        lower_names = [str(n).lower() for n in names]
+        is_id = np.array([("id" in n or n.endswith("_id")) for n in lower_names], dtype=bool)
+        unique_share = unique / summary.n_rows
+        id_mask = is_id & is_numeric & (unique_share < 1)
+        suspicious_id_duplicates = [
+            {
+                "column_name": name,
+                "unique_count": int(n_unique),
+                "unique_share": float(share),
+                "duplicate_share": 1.0 - float(share),
+            }
+            for name, n_unique, share in zip(
+                names[id_mask], unique[id_mask], unique_share[id_mask]
+            )
+        ]
 
     flags["has_suspicious_id_duplicates"] = len(suspicious_id_duplicates) > 0
     flags["suspicious_id_duplicates"] = suspicious_id_duplicates
 
     many_zero_values = []
-    if df is not None:
-        for col in summary.columns:
-            if col.is_numeric and col.name in df.columns:
-                zero_count = (df[col.name] == 0).sum()
-                total_non_null = col.non_null
-                if total_non_null > 0:
-                    zero_share = zero_count / total_non_null
-                    if zero_share > zero_threshold:
-                        many_zero_values.append({
-                            "column_name": col.name,  
-                            "zero_count": int(zero_count), 
-                            "zero_share": zero_share,
-                            "threshold": zero_threshold  
-                        })
+    if has_values:
+        num_non_null = non_null[num_mask]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zero_shares = np.where(num_non_null > 0, zero_counts / num_non_null, 0.0)
+        zero_mask = (num_non_null > 0) & (zero_shares > zero_threshold)
+        many_zero_values = [
+            {
+                "column_name": name,
+                "zero_count": int(count),
+                "zero_share": float(share),
+                "threshold": zero_threshold,
+            }
+            for name, count, share in zip(
+                names[num_mask][zero_mask], zero_counts[zero_mask], zero_shares[zero_mask]
+            )
+        ]
     else:
         flags["zero_check_skipped"] = "DataFrame не предоставлен для проверки нулевых значений"
     
@@ -303,21 +670,50 @@ def flatten_summary_for_print(summary: DatasetSummary) -> pd.DataFrame:
     """
     Превращает DatasetSummary в табличку для более удобного вывода.
     """
-    rows: List[Dict[str, Any]] = []
-    for col in summary.columns:
-        rows.append(
-            {
-                "name": col.name,
-                "dtype": col.dtype,
-                "non_null": col.non_null,
-                "missing": col.missing,
-                "missing_share": col.missing_share,
-                "unique": col.unique,
-                "is_numeric": col.is_numeric,
-                "min": col.min,
-                "max": col.max,
-                "mean": col.mean,
-                "std": col.std,
-            }
-        )
-    return pd.DataFrame(rows)
+    # Колонки таблицы заполняем в заранее выделенные массивы нужных типов,
+    # чтобы pandas не выводил типы по списку словарей
+    n = len(summary.columns)
+    names = np.empty(n, dtype=object)
+    dtypes = np.empty(n, dtype=object)
+    non_null = np.empty(n, dtype=np.int64)
+    missing = np.empty(n, dtype=np.int64)
+    missing_share = np.empty(n, dtype=np.float32)
+    unique = np.empty(n, dtype=np.int64)
+    is_numeric = np.empty(n, dtype=bool)
+    stats = np.full((4, n), np.nan)
+    has_stats = np.zeros(4, dtype=bool)
+
+    for i, col in enumerate(summary.columns):
+        names[i] = col.name
+        dtypes[i] = col.dtype
+        non_null[i] = col.non_null
+        missing[i] = col.missing
+        missing_share[i] = col.missing_share
+        unique[i] = col.unique
+        is_numeric[i] = col.is_numeric
+        if col.is_numeric:
+            for j, value in enumerate((col.min, col.max, col.mean, col.std)):
+                if value is not None:
+                    stats[j, i] = value
+                    has_stats[j] = True
+
+    # Колонка статистик, где нет ни одного значения, остаётся object с None, как раньше
+    stat_columns = [
+        stats[j] if has_stats[j] else np.full(n, None, dtype=object) for j in range(4)
+    ]
+
+    return pd.DataFrame(
+        {
+            "name": names,
+            "dtype": pd.Categorical(dtypes),
+            "non_null": non_null,
+            "missing": missing,
+            "missing_share": missing_share,
+            "unique": unique,
+            "is_numeric": is_numeric,
+            "min": stat_columns[0],
+            "max": stat_columns[1],
+            "mean": stat_columns[2],
+            "std": stat_columns[3],
+        }
+    )
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, Iterable, List, Union
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+from .core import correlation_matrix
+
 PathLike = Union[str, Path]
 
 
@@ -16,62 +18,112 @@ def _ensure_dir(path: PathLike) -> Path:
     return p
 
 
-def plot_histograms_per_column(
+def plot_histogram(
+    values: np.ndarray,
+    name: str,
+    out_path: PathLike,
+    bins: int = 20,
+) -> Path:
+    """
+    Гистограмма одной числовой колонки (значения без пропусков).
+    """
+    out_path = Path(out_path)
+
+    fig, ax = plt.subplots()
+    ax.hist(values, bins=bins)
+    ax.set_title(f"Histogram of {name}")
+    ax.set_xlabel(name)
+    ax.set_ylabel("Count")
+    fig.tight_layout()
+
+    fig.savefig(out_path)
+    plt.close(fig)
+    return out_path
+
+
+def histogram_jobs(
     df: pd.DataFrame,
     out_dir: PathLike,
     max_columns: int = 6,
-    bins: int = 20,
-) -> List[Path]:
+) -> List[Tuple[np.ndarray, str, Path]]:
     """
-    Для числовых колонок строит по отдельной гистограмме.
-    Возвращает список путей к PNG.
+    Аргументы для plot_histogram по первым max_columns числовым колонкам:
+    (значения без пропусков, имя колонки, путь к PNG). Пустые колонки пропускаются.
     """
-    out_dir = _ensure_dir(out_dir)
-    numeric_df = df.select_dtypes(include="number")
+    numeric_df = df.select_dtypes(include="number").iloc[:, :max_columns]
+    values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+    return histogram_jobs_from_array(values, list(numeric_df.columns), out_dir, max_columns=max_columns)
 
-    paths: List[Path] = []
-    for i, name in enumerate(numeric_df.columns[:max_columns]):
-        s = numeric_df[name].dropna()
-        if s.empty:
-            continue
 
-        fig, ax = plt.subplots()
-        ax.hist(s.values, bins=bins)
-        ax.set_title(f"Histogram of {name}")
-        ax.set_xlabel(name)
-        ax.set_ylabel("Count")
-        fig.tight_layout()
+def histogram_jobs_from_array(
+    values: np.ndarray,
+    columns: Sequence[str],
+    out_dir: PathLike,
+    max_columns: int = 6,
+) -> List[Tuple[np.ndarray, str, Path]]:
+    """
+    То же, что histogram_jobs, но по готовому числовому массиву (строки x колонки).
+    """
+    out_dir = _ensure_dir(out_dir)
 
-        out_path = out_dir / f"hist_{i+1}_{name}.png"
-        fig.savefig(out_path)
-        plt.close(fig)
+    jobs: List[Tuple[np.ndarray, str, Path]] = []
+    for i, name in enumerate(columns[:max_columns]):
+        col = values[:, i]
+        col = col[~np.isnan(col)]
+        if col.size == 0:
+            continue
+        jobs.append((col, name, out_dir / f"hist_{i+1}_{name}.png"))
+    return jobs
 
-        paths.append(out_path)
 
-    return paths
+def plot_histograms_per_column(
+    df: pd.DataFrame,
+    out_dir: PathLike,
+    max_columns: int = 6,
+    bins: int = 20,
+) -> List[Path]:
+    """
+    Для числовых колонок строит по отдельной гистограмме.
+    Возвращает список путей к PNG.
+    """
+    return [
+        plot_histogram(values, name, out_path, bins=bins)
+        for values, name, out_path in histogram_jobs(df, out_dir, max_columns=max_columns)
+    ]
 
 
 def plot_missing_matrix(df: pd.DataFrame, out_path: PathLike) -> Path:
     """
     Простая визуализация пропусков: где True=пропуск, False=значение.
     """
+    return plot_missing_mask(df.isna().to_numpy(), list(df.columns), out_path)
+
+
+def plot_missing_mask(
+    mask: np.ndarray,
+    columns: Sequence[str],
+    out_path: PathLike,
+) -> Path:
+    """
+    То же, что plot_missing_matrix, но по готовой булевой матрице пропусков
+    (строки x колонки) — её дешевле передавать в другой процесс, чем датафрейм.
+    """
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if df.empty:
+    if mask.size == 0:
         # Рисуем пустой график
         fig, ax = plt.subplots()
         ax.text(0.5, 0.5, "Empty dataset", ha="center", va="center")
         ax.axis("off")
     else:
-        mask = df.isna().values
-        fig, ax = plt.subplots(figsize=(min(12, df.shape[1] * 0.4), 4))
+        fig, ax = plt.subplots(figsize=(min(12, mask.shape[1] * 0.4), 4))
         ax.imshow(mask, aspect="auto", interpolation="none")
         ax.set_xlabel("Columns")
         ax.set_ylabel("Rows")
         ax.set_title("Missing values matrix")
-        ax.set_xticks(range(df.shape[1]))
-        ax.set_xticklabels(df.columns, rotation=90, fontsize=8)
+        ax.set_xticks(range(mask.shape[1]))
+        ax.set_xticklabels(columns, rotation=90, fontsize=8)
         ax.set_yticks([])
 
     fig.tight_layout()
@@ -84,18 +136,28 @@ def plot_correlation_heatmap(df: pd.DataFrame, out_path: PathLike) -> Path:
     """
     Тепловая карта корреляции числовых признаков.
     """
+    numeric_df = df.select_dtypes(include="number")
+    corr = correlation_matrix(numeric_df) if numeric_df.shape[1] >= 2 else pd.DataFrame()
+    return plot_correlation_matrix(corr, out_path)
+
+
+def plot_correlation_matrix(corr: pd.DataFrame, out_path: PathLike) -> Path:
+    """
+    Тепловая карта по уже посчитанной корреляционной матрице.
+    """
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    numeric_df = df.select_dtypes(include="number")
-    if numeric_df.shape[1] < 2:
+    if corr.shape[1] < 2:
         fig, ax = plt.subplots()
         ax.text(0.5, 0.5, "Not enough numeric columns for correlation", ha="center", va="center")
         ax.axis("off")
     else:
-        corr = numeric_df.corr(numeric_only=True)
+        # Матрица симметрична: рисуем только нижний треугольник с диагональю
+        upper = np.triu(np.ones(corr.shape, dtype=bool), k=1)
+        values = np.ma.masked_array(corr.to_numpy(), mask=upper)
         fig, ax = plt.subplots(figsize=(min(10, corr.shape[1]), min(8, corr.shape[0])))
-        im = ax.imshow(corr.values, vmin=-1, vmax=1, cmap="coolwarm", aspect="auto")
+        im = ax.imshow(values, vmin=-1, vmax=1, cmap="coolwarm", aspect="auto")
         ax.set_xticks(range(corr.shape[1]))
         ax.set_xticklabels(corr.columns, rotation=90, fontsize=8)
         ax.set_yticks(range(corr.shape[0]))
@@ -124,3 +186,24 @@ def save_top_categories_tables(
         table.to_csv(out_path, index=False)
         paths.append(out_path)
     return paths
+
+
+def save_top_categories_parquet(
+    top_cats: Dict[str, pd.DataFrame],
+    out_path: PathLike,
+) -> Optional[Path]:
+    """
+    Сохраняет top-k категорий всех колонок одним Parquet-файлом в длинном формате
+    (column_name/value/count/share). Возвращает None, если категорий нет.
+    """
+    if not top_cats:
+        return None
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    combined = pd.concat(
+        [table.assign(column_name=str(name)) for name, table in top_cats.items()],
+        ignore_index=True,
+    )
+    combined = combined[["column_name", "value", "count", "share"]]
+    combined.to_parquet(out_path, engine="pyarrow", compression="snappy", index=False)
+    return out_path
@@ -0,0 +1,415 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from typer.testing import CliRunner
+
+from eda_cli import cli
+from eda_cli.cli import _iter_csv, _load_csv, app
+from eda_cli.core import (
+    compute_quality_flags,
+    flatten_summary_for_print,
+    missing_table,
+    summarize_chunks,
+    summarize_dataset,
+    top_categories,
+)
+
+runner = CliRunner()
+
+
+def _write_csv(tmp_path: Path, text: str, name: str = "data.csv") -> Path:
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_load_csv_one_row(tmp_path):
+    """CSV из одной строки читается и описывается без ошибок"""
+    path = _write_csv(tmp_path, "a,b\n1,x\n")
+    summary = summarize_dataset(_load_csv(path))
+
+    a = summary.columns[0]
+    assert a.is_numeric and a.min == 1.0
+    assert np.isnan(a.std)
+
+
+def test_load_csv_bool_and_empty_columns(tmp_path):
+    """bool-колонка остаётся числовой, а полностью пустая — вещественной, как без pyarrow"""
+    path = _write_csv(tmp_path, "flag,empty,x\ntrue,,1\nfalse,,2\ntrue,,3\n")
+    df = _load_csv(path, use_cache=False)
+    summary = {c.name: c for c in summarize_dataset(df).columns}
+
+    assert summary["flag"].is_numeric
+    assert summary["flag"].mean == 2 / 3
+    assert summary["empty"].is_numeric
+    assert summary["empty"].missing == 3
+    assert pd.api.types.is_float_dtype(df["empty"])
+    # как и numpy bool, в числовой блок (корреляции, гистограммы) флаг не попадает
+    assert df.select_dtypes(include="number").columns.tolist() == ["empty", "x"]
+
+
+def test_report_duplicate_and_empty_headers(tmp_path):
+    """Повторяющиеся и пустые заголовки переименовываются как в pd.read_csv"""
+    path = _write_csv(tmp_path, "a,a,,b,a.1\n1,2,3,x,5\n2,3,4,y,6\n3,4,5,x,7\n")
+    df = _load_csv(path, use_cache=False)
+    assert df.columns.tolist() == ["a", "a.2", "Unnamed: 2", "b", "a.1"]
+
+    out = tmp_path / "out"
+    result = runner.invoke(app, ["report", str(path), "--out-dir", str(out), "--no-cache"])
+    assert result.exit_code == 0, result.output
+    summary = pd.read_csv(out / "summary.csv")
+    assert summary["name"].tolist() == ["a", "a.2", "Unnamed: 2", "b", "a.1"]
+
+
+def test_date_columns_are_categorical(tmp_path):
+    """Даты из CSV, как и раньше (строки object), попадают в топ-категории и проверку кардинальности"""
+    path = _dated_csv(tmp_path)
+    df = _load_csv(path, use_cache=False)
+    assert str(df["day"].dtype) == "date32[day][pyarrow]"
+
+    top_cats = top_categories(df)
+    assert list(top_cats) == ["day", "city"]
+    assert top_cats["day"]["value"].iloc[0] == "2024-01-01"
+
+    flags = compute_quality_flags(summarize_dataset(df), missing_table(df), df)
+    assert [c["column_name"] for c in flags["high_cardinality_categoricals"]] == ["day"]
+
+def test_iter_csv_types_match_full_read(tmp_path, monkeypatch):
+    """Потоковое чтение по нескольким блокам выводит те же типы и статистики, что и полное"""
+    monkeypatch.setattr(cli, "_ARROW_STREAM_BLOCK_SIZE", 64)
+    rows = "".join(f"{i},2024-01-{i % 28 + 1:02d},{'true' if i % 3 else 'false'},c{i % 4}\n" for i in range(40))
+    path = _write_csv(tmp_path, "a,day,flag,cat\n" + rows)
+
+    chunks = list(_iter_csv(path))
+    assert len(chunks) > 1
+
+    streamed = flatten_summary_for_print(summarize_chunks(chunks))
+    full = flatten_summary_for_print(summarize_dataset(_load_csv(path, use_cache=False)))
+    pd.testing.assert_frame_equal(streamed, full)
+    assert streamed["dtype"].tolist() == ["int64[pyarrow]", "date32[day][pyarrow]", "boolean", "string[pyarrow]"]
+
+
+def test_overview_falls_back_when_types_change(tmp_path, monkeypatch):
+    """Если тип колонки меняется после первого блока, overview показывает типы полного чтения"""
+    monkeypatch.setattr(cli, "_ARROW_STREAM_BLOCK_SIZE", 64)
+    rows = "".join(f"{i},{i}\n" for i in range(30))
+    path = _write_csv(tmp_path, "a,b\n" + rows + "x,1.5\n")
+
+    result = runner.invoke(app, ["overview", str(path), "--no-cache"])
+    assert result.exit_code == 0, result.output
+
+    full = flatten_summary_for_print(summarize_dataset(_load_csv(path, use_cache=False)))
+    assert full["dtype"].tolist() == ["string[pyarrow]", "double[pyarrow]"]
+    assert full.to_string(index=False) in result.output
+
+
+def _report_artifacts(out_dir: Path) -> dict:
+    """Содержимое табличных артефактов отчёта и report.md без строки с датой генерации"""
+    result = {}
+    for f in sorted(out_dir.iterdir()):
+        if f.suffix == ".png":
+            result[f.name] = None
+        elif f.suffix == ".parquet":
+            result[f.name] = pd.read_parquet(f)
+        else:
+            lines = f.read_text(encoding="utf-8").splitlines()
+            result[f.name] = [line for line in lines if "Дата генерации" not in line]
+    return result
+
+
+def _assert_same_artifacts(a: dict, b: dict) -> None:
+    assert a.keys() == b.keys()
+    for name in a:
+        if isinstance(a[name], pd.DataFrame):
+            pd.testing.assert_frame_equal(a[name], b[name])
+        else:
+            assert a[name] == b[name], name
+
+
+def _dated_csv(tmp_path: Path) -> Path:
+    rows = "".join(
+        f"{i},2024-01-{i % 28 + 1:02d},{'A' if i % 3 else 'B'},{i % 5 * 1.5}\n" for i in range(40)
+    )
+    return _write_csv(tmp_path, "id,day,city,value\n" + rows)
+
+
+def test_overview_then_report_matches_report_alone(tmp_path):
+    """Кэш, записанный overview, даёт report тот же результат, что и чтение CSV"""
+    path = _dated_csv(tmp_path)
+    cache = path.with_name(path.name + ".parquet")
+
+    alone = tmp_path / "alone"
+    result = runner.invoke(app, ["report", str(path), "--out-dir", str(alone), "--no-cache"])
+    assert result.exit_code == 0, result.output
+
+    result = runner.invoke(app, ["overview", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "date32[day][pyarrow]" in result.output
+    assert cache.exists()
+
+    chained = tmp_path / "chained"
+    result = runner.invoke(app, ["report", str(path), "--out-dir", str(chained)])
+    assert result.exit_code == 0, result.output
+
+    _assert_same_artifacts(_report_artifacts(alone), _report_artifacts(chained))
+
+
+def _forbid_csv_parsing(monkeypatch) -> None:
+    """Любая попытка разобрать CSV заново роняет тест: данные должны прийти из кэша"""
+    def fail(*args, **kwargs):
+        raise AssertionError("CSV разбирается повторно")
+
+    monkeypatch.setattr(cli.pa_csv, "read_csv", fail)
+    monkeypatch.setattr(cli.pa_csv, "open_csv", fail)
+
+
+def test_load_csv_cache_round_trip(tmp_path, monkeypatch):
+    """Кэш рядом с CSV возвращает тот же датафрейм без повторного разбора"""
+    path = _dated_csv(tmp_path)
+    cache = path.with_name(path.name + ".parquet")
+
+    df = _load_csv(path)
+    assert cache.exists()
+
+    with monkeypatch.context() as m:
+        _forbid_csv_parsing(m)
+        cached = _load_csv(path)
+    pd.testing.assert_frame_equal(cached, df)
+
+
+def test_load_csv_rejects_stale_cache(tmp_path):
+    """После изменения файла или при другом разделителе старый кэш не используется"""
+    path = _write_csv(tmp_path, "a,b\n1,x\n2,y\n")
+    _load_csv(path)
+
+    path.write_text("a,b\n1,x\n2,y\n3,z\n", encoding="utf-8")
+    assert len(_load_csv(path)) == 3
+
+    df = _load_csv(path, sep=";")
+    assert df.columns.tolist() == ["a,b"]
+
+
+def test_no_cache_does_not_write_sidecar(tmp_path):
+    """--no-cache не создаёт и не читает Parquet-кэш"""
+    path = _dated_csv(tmp_path)
+    cache = path.with_name(path.name + ".parquet")
+
+    result = runner.invoke(app, ["overview", str(path), "--no-cache"])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(app, ["report", str(path), "--out-dir", str(tmp_path / "out"), "--no-cache"])
+    assert result.exit_code == 0, result.output
+    assert not cache.exists()
+
+
+def test_report_cache_hit_matches_fresh_read(tmp_path, monkeypatch):
+    """Повторный report из кэша даёт те же артефакты и не разбирает CSV"""
+    path = _dated_csv(tmp_path)
+    first = tmp_path / "first"
+    result = runner.invoke(app, ["report", str(path), "--out-dir", str(first)])
+    assert result.exit_code == 0, result.output
+
+    _forbid_csv_parsing(monkeypatch)
+    second = tmp_path / "second"
+    result = runner.invoke(app, ["report", str(path), "--out-dir", str(second)])
+    assert result.exit_code == 0, result.output
+
+    _assert_same_artifacts(_report_artifacts(first), _report_artifacts(second))
+
+    result = runner.invoke(app, ["overview", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "date32[day][pyarrow]" in result.output
+
+
+def test_overview_streaming_matches_cached(tmp_path):
+    """overview без кэша (по частям) и из кэша печатает одно и то же"""
+    path = _dated_csv(tmp_path)
+
+    streamed = runner.invoke(app, ["overview", str(path)])
+    assert streamed.exit_code == 0, streamed.output
+    assert path.with_name(path.name + ".parquet").exists()
+
+    cached = runner.invoke(app, ["overview", str(path)])
+    assert cached.exit_code == 0, cached.output
+    assert cached.output == streamed.output
+    assert "Строк: 40" in streamed.output
+
+
+def test_head_reads_only_file_start(tmp_path, monkeypatch):
+    """head выводит первые n строк, не читая файл целиком"""
+    path = _dated_csv(tmp_path)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("head читает файл целиком")
+
+    monkeypatch.setattr(cli, "_load_csv", fail)
+    monkeypatch.setattr(cli.pa_csv, "read_csv", fail)
+
+    result = runner.invoke(app, ["head", str(path), "--n", "3"])
+    assert result.exit_code == 0, result.output
+    assert "Количество строк: больше 3" in result.output
+    assert "2024-01-03" in result.output
+    assert "2024-01-04" not in result.output
+
+    result = runner.invoke(app, ["head", str(path), "--n", "40"])
+    assert result.exit_code == 0, result.output
+    assert "Количество строк: 40" in result.output
+
+
+
+def test_write_table_formats(tmp_path):
+    """_write_table сохраняет таблицу в каждом формате с расширением по формату"""
+    df = pd.DataFrame({"x": [1.0, 2.0], "y": ["a", "b"]}, index=pd.Index(["r1", "r2"], name="col"))
+
+    csv_path = cli._write_table(df, tmp_path / "t", "csv", index=True)
+    assert csv_path.name == "t.csv"
+    pd.testing.assert_frame_equal(pd.read_csv(csv_path, index_col=0), df)
+
+    parquet_path = cli._write_table(df, tmp_path / "t", "parquet", index=True)
+    assert parquet_path.name == "t.parquet"
+    pd.testing.assert_frame_equal(pd.read_parquet(parquet_path), df)
+
+    feather_path = cli._write_table(df, tmp_path / "t", "feather", index=True)
+    assert feather_path.name == "t.feather"
+    pd.testing.assert_frame_equal(pd.read_feather(feather_path), df.reset_index())
+
+
+def test_report_rejects_unknown_format(tmp_path):
+    path = _dated_csv(tmp_path)
+    result = runner.invoke(app, ["report", str(path), "--out-dir", str(tmp_path / "out"), "--format", "xlsx"])
+    assert result.exit_code != 0
+
+
+def test_report_table_formats(tmp_path):
+    """report пишет таблицы в форматах из --format и --corr-format"""
+    path = _dated_csv(tmp_path)
+    out = tmp_path / "out"
+    result = runner.invoke(
+        app,
+        ["report", str(path), "--out-dir", str(out), "--format", "feather", "--corr-format", "csv", "--no-cache"],
+    )
+    assert result.exit_code == 0, result.output
+
+    names = {f.name for f in out.iterdir()}
+    assert {"summary.feather", "missing.feather", "correlation.csv", "correlation_pairs.feather"} <= names
+
+    corr = pd.read_csv(out / "correlation.csv", index_col=0)
+    assert corr.columns.tolist() == ["id", "value"]
+    pairs = pd.read_feather(out / "correlation_pairs.feather")
+    assert pairs.columns.tolist() == ["col_i", "col_j", "corr"]
+
+
+def test_report_top_categories_parquet(tmp_path):
+    """Топ-категории всех колонок пишутся одним Parquet-файлом в длинном формате"""
+    path = _dated_csv(tmp_path)
+    out = tmp_path / "out"
+    result = runner.invoke(app, ["report", str(path), "--out-dir", str(out), "--no-cache"])
+    assert result.exit_code == 0, result.output
+    assert not (out / "top_categories").exists()
+
+    top = pd.read_parquet(out / "top_categories.parquet")
+    assert top.columns.tolist() == ["column_name", "value", "count", "share"]
+    city = top[top["column_name"] == "city"]
+    assert city["value"].tolist() == ["A", "B"]
+    assert city["count"].tolist() == [26, 14]
+    assert city["share"].sum() == 1.0
+
+
+def test_report_legacy_top_categories(tmp_path):
+    """--legacy-top-cats возвращает отдельный CSV на каждую колонку"""
+    path = _dated_csv(tmp_path)
+    out = tmp_path / "out"
+    result = runner.invoke(app, ["report", str(path), "--out-dir", str(out), "--legacy-top-cats", "--no-cache"])
+    assert result.exit_code == 0, result.output
+
+    assert not (out / "top_categories.parquet").exists()
+    city = pd.read_csv(out / "top_categories" / "top5_values_city.csv")
+    assert city["value"].tolist() == ["A", "B"]
+
+
+def test_overview_and_head_header_only(tmp_path):
+    """CSV только с заголовком: колонки всё равно перечисляются"""
+    path = _write_csv(tmp_path, "a,b\n")
+
+    result = runner.invoke(app, ["overview", str(path), "--no-cache"])
+    assert result.exit_code == 0, result.output
+    assert "Строк: 0" in result.output
+    assert "Столбцов: 2" in result.output
+
+    result = runner.invoke(app, ["head", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "Количество колонок: 2" in result.output
+
+
+def test_overview_duplicate_headers(tmp_path):
+    """Потоковый overview переименовывает повторяющиеся заголовки так же, как полное чтение"""
+    path = _write_csv(tmp_path, "a,a,b\n1,2,x\n3,4,y\n")
+
+    result = runner.invoke(app, ["overview", str(path), "--no-cache"])
+    assert result.exit_code == 0, result.output
+    assert "Столбцов: 3" in result.output
+    assert " a.1 " in result.output
+
+
+def test_render_report_md_without_files():
+    """Markdown-отчёт собирается в памяти из готовых структур, без записи на диск"""
+    df = pd.DataFrame(
+        {
+            "age": [10, 20, None, None],
+            "city": ["A", "B", "A", None],
+        }
+    )
+    summary = summarize_dataset(df)
+    missing_df = missing_table(df)
+    flags = compute_quality_flags(summary, missing_df, df, min_missing_threshold=0.3)
+
+    md = cli._render_report_md(
+        title="Тест",
+        source_name="data.csv",
+        summary=summary,
+        quality_flags=flags,
+        missing_df=missing_df,
+        corr_df=pd.DataFrame(),
+        top_cats=top_categories(df),
+        max_hist_columns=6,
+        top_k_categories=3,
+        min_missing_share=0.3,
+        num_numeric=1,
+        table_format="parquet",
+    )
+
+    assert md.startswith("# Тест\n")
+    assert "**Исходный файл:** `data.csv`" in md
+    assert "- `age`: 50.0% пропусков" in md
+    assert "Всего проблемных колонок: **1**" in md
+    assert "`summary.parquet`" in md
+    assert "Недостаточно числовых колонок для анализа корреляции." in md
+    assert "в файле `top_categories.parquet`" in md
+    assert "Гистограммы для 1 из 1 числовых колонок." in md
+
+
+def test_report_skips_correlation_and_lists_written_files(tmp_path):
+    """Без двух числовых колонок корреляция не пишется и не упоминается в итоговой сводке"""
+    path = _write_csv(tmp_path, "x,city\n1,A\n2,B\n3,A\n")
+    out = tmp_path / "out"
+    result = runner.invoke(app, ["report", str(path), "--out-dir", str(out), "--no-cache"])
+    assert result.exit_code == 0, result.output
+
+    names = {f.name for f in out.iterdir()}
+    assert not names & {"correlation.parquet", "correlation_pairs.csv", "correlation_heatmap.png"}
+    assert "- Табличные файлы: summary.csv, missing.csv, top_categories.parquet" in result.output
+    assert "- Графики: hist_*.png, missing_matrix.png\n" in result.output
+
+
+def test_report_header_only_skips_correlation(tmp_path):
+    """В CSV без строк нет корреляции, топ-категорий и гистограмм"""
+    path = _write_csv(tmp_path, "a,b\n")
+    out = tmp_path / "out"
+    result = runner.invoke(app, ["report", str(path), "--out-dir", str(out), "--no-cache"])
+    assert result.exit_code == 0, result.output
+
+    assert {f.name for f in out.iterdir()} == {"report.md", "summary.csv", "missing_matrix.png"}
+    assert "- Табличные файлы: summary.csv\n" in result.output
+    assert "- Графики: missing_matrix.png\n" in result.output
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
+import pytest
 
 from eda_cli.core import (
     compute_quality_flags,
     correlation_matrix,
+    correlation_pairs,
     flatten_summary_for_print,
     missing_table,
+    summarize_chunks,
     summarize_dataset,
     top_categories,
 )
@@ -36,6 +40,41 @@ def test_summarize_dataset_basic():
     assert "missing_share" in summary_df.columns
 
 
+def test_summarize_chunks_matches_full_summary():
+    df = _sample_df()
+    chunks = [df.iloc[:3], df.iloc[3:]]
+
+    full = flatten_summary_for_print(summarize_dataset(df))
+    chunked = flatten_summary_for_print(summarize_chunks(chunks))
+    pd.testing.assert_frame_equal(full, chunked)
+
+
+def test_summarize_chunks_bounds_distinct_memory(monkeypatch):
+    """Уникальные значения: точно до предела, дальше — оценка без роста памяти"""
+    from eda_cli import core
+
+    monkeypatch.setattr(core, "_DISTINCT_LIMIT", 256)
+    df = pd.DataFrame({"id": np.arange(20000), "group": np.arange(20000) % 100})
+    chunks = [df.iloc[i : i + 1000] for i in range(0, len(df), 1000)]
+
+    summary = summarize_chunks(chunks)
+    ids, groups = summary.columns
+    assert groups.unique == 100
+    assert ids.unique == pytest.approx(20000, rel=0.3)
+
+
+def test_flatten_summary_without_numeric_columns():
+    """Без числовых колонок статистики остаются None (object), а не NaN"""
+    summary_df = flatten_summary_for_print(summarize_dataset(pd.DataFrame({"city": ["A", "B"]})))
+    assert summary_df["min"].dtype == object
+    assert summary_df["min"].tolist() == [None]
+    assert "None" in summary_df.to_string(index=False)
+
+    mixed = flatten_summary_for_print(summarize_dataset(_sample_df()))
+    assert mixed["min"].dtype == np.float64
+    assert np.isnan(mixed["min"].iloc[2])
+
+
 def test_missing_table_and_quality_flags():
     df = _sample_df()
     missing_df = missing_table(df)
@@ -60,6 +99,65 @@ def test_correlation_and_top_categories():
     assert "value" in city_table.columns
     assert len(city_table) <= 2
 
+def test_correlation_matrix_matches_pandas_with_missing():
+    df = pd.DataFrame(
+        {
+            "a": [1.0, 2.0, None, 4.0, 5.0, 6.0],
+            "b": [2.0, 1.0, 3.0, None, 7.0, 5.0],
+            "c": [0.5, 0.1, 0.9, 0.3, None, 0.2],
+            "const": [1.0] * 6,
+        }
+    )
+    corr = correlation_matrix(df)
+    pd.testing.assert_frame_equal(corr, df.corr(), rtol=1e-9)
+
+def test_correlation_matrix_keeps_float32():
+    df = pd.DataFrame(
+        {
+            "a": [1.0, 2.0, None, 4.0, 5.0, 6.0],
+            "b": [2.0, 1.0, 3.0, None, 7.0, 5.0],
+        }
+    )
+    corr = correlation_matrix(df.astype("float32"))
+
+    assert (corr.dtypes == "float32").all()
+    pd.testing.assert_frame_equal(corr.astype("float64"), df.corr(), rtol=1e-5)
+
+
+@pytest.mark.parametrize("with_missing", [True, False])
+def test_correlation_matrix_float32_large_values(with_missing):
+    """Во float32 большие значения (метки времени в нс) не переполняются и не обнуляют корреляцию"""
+    rng = np.random.default_rng(0)
+    ts = 1.7e18 + rng.normal(0, 1e15, size=200)
+    df = pd.DataFrame({"ts": ts, "lag": ts + rng.normal(0, 5e13, size=200), "noise": rng.normal(size=200)})
+    if with_missing:
+        df.iloc[::7, 0] = np.nan
+        df.iloc[::11, 1] = np.nan
+
+    expected = df.corr()
+    result = correlation_matrix(df.astype(np.float32))
+    assert result.to_numpy().dtype == np.float32
+    assert result.loc["ts", "lag"] > 0.99
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), atol=1e-3)
+
+
+def test_correlation_pairs_upper_triangle():
+    df = pd.DataFrame({"a": [1, 2, 3, 4], "b": [4, 3, 2, 1], "c": [1, 3, 2, 4]})
+    corr = correlation_matrix(df)
+    pairs = correlation_pairs(corr)
+
+    assert list(pairs.columns) == ["col_i", "col_j", "corr"]
+    assert len(pairs) == 3
+    assert list(zip(pairs["col_i"], pairs["col_j"])) == [("a", "b"), ("a", "c"), ("b", "c")]
+    assert pairs.iloc[0]["corr"] == -1.0
+
+def test_top_categories_selects_most_frequent():
+    df = pd.DataFrame({"c": ["x", "y", "z", "y", "w", "z", "y", None, "v", "x"]})
+
+    table = top_categories(df, top_k=3)["c"]
+    assert list(table["value"]) == ["y", "x", "z"]
+    assert list(table["count"]) == [3, 2, 2]
+
 def test_compute_quality_flags_constant_columns():
     """Тест для эвристики has_constant_columns"""
     df = pd.DataFrame({
@@ -148,6 +246,31 @@ def test_compute_quality_flags_many_zero_values():
     assert 'no_zeros' not in problem_cols 
 
 
+def test_compute_quality_flags_numeric_block_matches_df():
+    """Готовый числовой блок (float32, F-order) даёт те же флаги, что и извлечение из df"""
+    df = pd.DataFrame(
+        {
+            "zeros": [0, 0, 0, 1, np.nan],
+            "const": [5.0, 5.0, 5.0, 5.0, 5.0],
+            "flag": pd.array([False, False, False, True, None], dtype="boolean"),
+            "city": ["A", "B", "C", "D", "E"],
+        }
+    )
+    summary = summarize_dataset(df)
+    missing_df = missing_table(df)
+    numeric = df.select_dtypes(include="number")
+    block = np.asfortranarray(numeric.to_numpy(dtype=np.float32, na_value=np.nan))
+
+    from_df = compute_quality_flags(summary, missing_df, df)
+    from_block = compute_quality_flags(
+        summary, missing_df, df, numeric_block=block, numeric_columns=list(numeric.columns)
+    )
+
+    assert from_block == from_df
+    assert from_block["constant_columns"] == ["const"]
+    assert [c["column_name"] for c in from_block["many_zero_values"]] == ["zeros", "flag"]
+
+
 def test_compute_quality_flags_cli_parameters():
     """Тест для проверки передачи параметров из CLI"""
     df = pd.DataFrame({
@@ -202,4 +325,44 @@ def test_compute_quality_flags_all_new_heuristics():
     assert len(flags['many_zero_values']) > 0
     
     assert 0.0 <= flags['quality_score'] <= 1.0
-    assert flags['quality_score'] < 1.0
\ No newline at end of file
+    assert flags['quality_score'] < 1.0
+
+def test_top_categories_arrow_strings():
+    """Строковые колонки с Arrow-бэкендом тоже считаются категориальными"""
+    df = _sample_df().convert_dtypes(dtype_backend="pyarrow")
+
+    top_cats = top_categories(df, max_columns=5, top_k=2)
+    assert "city" in top_cats
+    assert top_cats["city"].iloc[0]["value"] == "A"
+
+
+def test_summarize_dataset_arrow_single_value():
+    """Arrow-колонка с одним непустым значением: std = NaN, а не ошибка на pd.NA"""
+    df = pd.DataFrame(
+        {
+            "rare": pd.array([None] * 49 + [7], dtype="int64[pyarrow]"),
+            "x": pd.array(range(50), dtype="int64[pyarrow]"),
+        }
+    )
+    summary = summarize_dataset(df)
+    rare = summary.columns[0]
+
+    assert rare.is_numeric
+    assert rare.min == rare.max == rare.mean == 7.0
+    assert np.isnan(rare.std)
+    assert summary.columns[1].std == pytest.approx(df["x"].astype("float64").std())
+
+
+
+def test_col_scan_numba_matches_numpy():
+    """Скомпилированный проход по колонкам совпадает с numpy-версией"""
+    pytest.importorskip("numba")
+    from eda_cli.core import _col_scan_numba, _col_scan_numpy
+
+    arr = np.array([[0.0, 1.0, np.nan], [2.0, 0.0, np.nan], [0.0, 5.0, np.nan]])
+    expected = _col_scan_numpy(arr)
+    result = _col_scan_numba()(np.asfortranarray(arr))
+
+    for got, exp in zip(result, expected):
+        np.testing.assert_array_equal(got, exp)
+    np.testing.assert_array_equal(expected[0], [2, 1, 0])